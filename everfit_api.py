@@ -1,8 +1,72 @@
+import asyncio
+import json
 import requests
 import pandas as pd
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from everfit_config import *
 
+def make_session():
+    """
+    Creates a requests.Session configured for batch use of the Everfit API.
+
+    The default session only pools 10 connections and does not retry, which
+    caps concurrency and re-runs TLS handshakes under parallel uploads. This
+    mounts a larger pool with retry/backoff on transient server errors and
+    requests compressed responses.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    # Retry is opted in for POST/PUT as well: urllib3 only retries idempotent
+    # methods by default, but every write here is safe to retry on the listed
+    # statuses because the server rejected or never processed the request
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.3,
+                          status_forcelist=[429, 500, 502, 503, 504],
+                          allowed_methods=["POST", "GET", "PUT"]),
+    )
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    return session
+
+# Helper function to parse a response body as JSON
+def parse_response_json(response):
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses ValueError, so existing handlers still apply
+        return orjson.loads(response.content)
+    return response.json()
+
+# Helper function to serialize a request payload to JSON bytes
+# Every request already sends an explicit JSON Content-Type header, so the
+# body can be passed pre-serialized instead of going through requests' own
+# stdlib json.dumps
+def dump_request_json(payload):
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
 def login(session, email, password):
     """
     Logs into the Everfit API using the provided email and password and retrieves an access token.
@@ -40,14 +104,14 @@ def login(session, email, password):
 
     # Send a POST request to log in
     try:
-        response = session.post(url, json=payload, headers=headers, timeout=30)
+        response = session.post(url, data=dump_request_json(payload), headers=headers, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Login request failed: {e}")
         return None
     
     try:
-        data = response.json()
+        data = parse_response_json(response)
     except ValueError as e:
         print(f"Failed to parse response JSON: {e}")
         return None
@@ -80,14 +144,14 @@ def put_exercise(session, access_token, exercise_id, payload):
 
     # Send the PUT request to update the exercise
     try:
-        response = session.put(url, json=payload, headers=headers, timeout=30)
+        response = session.put(url, data=dump_request_json(payload), headers=headers, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Failed to update exercise: {e}")
         return None
 
     try:
-        data = response.json()
+        data = parse_response_json(response)
     except ValueError as e:
         print(f"Failed to parse response JSON: {e}")
         return None
@@ -125,20 +189,144 @@ def post_exercise(session, payload, access_token):
 
     # Send the POST request to add the exercise
     try:
-        response = session.post(url, json=payload, headers=headers, timeout=30)
+        response = session.post(url, data=dump_request_json(payload), headers=headers, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Failed to add exercise: {e}")
         return None
 
     try:
-        data = response.json()
+        data = parse_response_json(response)
     except ValueError as e:
         print(f"Failed to parse response JSON: {e}")
         return None
 
     return data
 
+def batch_post_exercises(session, access_token, payloads, workers=16):
+    """
+    Uploads multiple exercises concurrently using a thread pool.
+
+    Uploads are network-latency bound, so posting them in parallel over a
+    shared connection pool cuts wall-clock time roughly by the worker count.
+
+    Args:
+        session (requests.Session): The active session used to make the requests.
+        access_token (str): The access token for authenticating the requests.
+        payloads (list): A list of exercise payload dictionaries to upload.
+        workers (int): The maximum number of concurrent uploads.
+
+    Returns:
+        list: The response data (or None) for each payload, in the same order as payloads.
+    """
+
+    # Validate inputs
+    if not isinstance(access_token, str) or not access_token.strip():
+        raise ValueError("Access token must be a non-empty string.")
+
+    payloads = list(payloads)
+    if not payloads:
+        return []
+
+    # Prefer a single multiplexed HTTP/2 connection when httpx is installed
+    if httpx is not None:
+        try:
+            return batch_post_exercises_http2(access_token, payloads, workers=workers)
+        except ImportError:
+            # The h2 extra is not installed; fall back to threaded uploads
+            pass
+
+    workers = min(workers, len(payloads))
+
+    # Make sure the session's connection pool is large enough for the workers,
+    # with retries on transient server errors (including the POSTs themselves).
+    # Only remount when the current pool is too small: replacing the adapter
+    # discards its warm keep-alive connections, which would force a fresh TLS
+    # handshake on every call (and every chunk of a chunked upload)
+    adapter = session.get_adapter("https://")
+    if getattr(adapter, "_pool_maxsize", 0) < workers:
+        session.mount("https://", HTTPAdapter(
+            pool_connections=workers,
+            pool_maxsize=workers,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=["POST", "GET", "PUT"]),
+        ))
+
+    # Post all exercises concurrently
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda payload: post_exercise(session, payload, access_token),
+            payloads,
+        ))
+
+    return results
+
+def batch_post_exercises_http2(access_token, payloads, workers=16):
+    """
+    Uploads multiple exercises over a single multiplexed HTTP/2 connection.
+
+    All uploads share one TCP+TLS connection, so there is only one handshake
+    for the whole batch and the server can process the requests in parallel.
+    A semaphore caps how many requests are in flight at once. Requires the
+    optional httpx dependency with its http2 extra.
+
+    Args:
+        access_token (str): The access token for authenticating the requests.
+        payloads (list): A list of exercise payload dictionaries to upload.
+        workers (int): The maximum number of requests in flight at once.
+
+    Returns:
+        list: The response data (or None) for each payload, in the same order as payloads.
+    """
+
+    # Validate inputs
+    if not isinstance(access_token, str) or not access_token.strip():
+        raise ValueError("Access token must be a non-empty string.")
+    if httpx is None:
+        raise RuntimeError("httpx is required for HTTP/2 uploads.")
+
+    # Define url
+    url = "https://api-prod3.everfit.io/api/exercise/add"
+
+    # Define headers
+    headers = {
+        "Content-Type": "application/json;charset=UTF-8",
+        "X-Access-Token": access_token,
+        "X-App-Type": "web-coach",
+    }
+
+    async def post_one(client, semaphore, payload):
+        # Send the POST request to add the exercise, retrying transient
+        # server errors with backoff to match the requests adapter's policy
+        async with semaphore:
+            body = dump_request_json(payload)
+            try:
+                for attempt in range(4):
+                    response = await client.post(url, content=body)
+                    if response.status_code not in (429, 500, 502, 503, 504) or attempt == 3:
+                        break
+                    await asyncio.sleep(0.3 * (2 ** attempt))
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                print(f"Failed to add exercise: {e}")
+                return None
+
+        try:
+            data = parse_response_json(response)
+        except ValueError as e:
+            print(f"Failed to parse response JSON: {e}")
+            return None
+
+        return data
+
+    async def post_all():
+        semaphore = asyncio.Semaphore(workers)
+        async with httpx.AsyncClient(http2=True, timeout=30, headers=headers) as client:
+            return await asyncio.gather(*[post_one(client, semaphore, payload) for payload in payloads])
+
+    return asyncio.run(post_all())
+
 def get_exercises(session, access_token):
     """
     Retrieves a list of exercises from the Everfit API.
@@ -155,7 +343,9 @@ def get_exercises(session, access_token):
     if not isinstance(access_token, str) or not access_token.strip():
         raise ValueError("Access token must be a non-empty string.")
 
-    total_exercises = 50
+    # Ask for a large page up front so a single request usually covers the
+    # whole library, instead of probing the total with a throwaway request
+    per_page = 10000
 
     # Define urls
     url = "https://api-prod3.everfit.io/api/exercise/search_filter_library"
@@ -170,7 +360,7 @@ def get_exercises(session, access_token):
         "movement_patterns": [],
         "muscle_groups": [],
         "page": 1,
-        "per_page": total_exercises,
+        "per_page": per_page,
         "q": "",
         "sort": -1,
         "sorter": "last_interacted",
@@ -187,14 +377,14 @@ def get_exercises(session, access_token):
 
     # Send a POST request to the url   
     try:
-        initial_response = session.post(url, json=payload, headers=headers, timeout=30)
+        initial_response = session.post(url, data=dump_request_json(payload), headers=headers, timeout=30)
         initial_response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Failed to retrieve exercises: {e}")
         return None
     
     try:
-        initial_data = initial_response.json()
+        initial_data = parse_response_json(initial_response)
         total_exercises = initial_data.get('total', 0)
         if not isinstance(total_exercises, int) or total_exercises <= 0:
             print("No exercises found.")
@@ -203,34 +393,50 @@ def get_exercises(session, access_token):
         print(f"Failed to parse initial response JSON: {e}")
         return None
 
+    # Done if the first page already holds the whole library
+    exercises = initial_data.get('data', [])
+    if len(exercises) >= total_exercises:
+        return exercises
+
     payload["per_page"] = total_exercises
 
     # Send request to get all exercises
     try:
-        response = session.post(url, json=payload, headers=headers, timeout=30)
+        response = session.post(url, data=dump_request_json(payload), headers=headers,
+                                stream=ijson is not None, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Failed to retrieve exercises: {e}")
         return None
 
+    # Stream-parse just the exercise objects when ijson is installed, so the
+    # full response tree is never materialized at once
+    if ijson is not None:
+        try:
+            response.raw.decode_content = True
+            return list(ijson.items(response.raw, 'data.item'))
+        except ijson.JSONError as e:
+            print(f"Failed to parse response JSON: {e}")
+            return None
+
     try:
-        data = response.json()
+        data = parse_response_json(response)
     except ValueError as e:
         print(f"Failed to parse response JSON: {e}")
         return None
-    
+
     return data['data']
 
 def get_tag_list(session, access_token):
     """
-    Retrieves the full list of tags from the Everfit API.
+    Retrieves the full list of tags from the Everfit API as a name-to-ID mapping.
 
     Args:
         session (requests.Session): The active session used to make the request.
         access_token (str): The access token for authenticating the request.
 
     Returns:
-        list: A list of tags if successful, or None if the request fails.
+        dict: A dictionary mapping tag names to tag IDs if successful, or None if the request fails.
     """
 
     # Validate access_token
@@ -247,10 +453,11 @@ def get_tag_list(session, access_token):
         "x-app-type": "web-coach",
     }
 
-    # First request to get total number of tags
+    # Ask for a large page up front so a single request usually covers every
+    # tag, instead of probing the total with a throwaway request
     params = {
         "sorter": "name",
-        "per_page": 1,  # Get minimal data to retrieve total
+        "per_page": 10000,
         "page": 1,
         "sort": 1,
         "text_search": "",
@@ -263,35 +470,38 @@ def get_tag_list(session, access_token):
     except requests.exceptions.RequestException as e:
         print(f"Failed to retrieve tags: {e}")
         return None
-    
+
     try:
-        data = response.json()
+        data = parse_response_json(response)
         total_tags = data.get('data', {}).get('total', 0)
         if not isinstance(total_tags, int) or total_tags <= 0:
             print("No tags found.")
-            return []
+            return {}
+        tag_list = data.get('data', {}).get('data', [])
     except ValueError as e:
         print(f"Failed to parse response JSON: {e}")
         return None
-    
-    # Second request to get all tags
-    params['per_page'] = total_tags
 
-    try:
-        tag_list_response = session.get(base_url, headers=headers, params=params, timeout=30)
-        tag_list_response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Failed to retrieve the full list of tags: {e}")
-        return None
+    # Second request only if the server truncated the first page
+    if len(tag_list) < total_tags:
+        params['per_page'] = total_tags
 
-    try:
-        tag_data = tag_list_response.json()
-        tag_list = tag_data.get('data', {}).get('data', [])
-    except ValueError as e:
-        print(f"Failed to parse tag list JSON: {e}")
-        return None
+        try:
+            tag_list_response = session.get(base_url, headers=headers, params=params, timeout=30)
+            tag_list_response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to retrieve the full list of tags: {e}")
+            return None
 
-    return tag_list
+        try:
+            tag_data = parse_response_json(tag_list_response)
+            tag_list = tag_data.get('data', {}).get('data', [])
+        except ValueError as e:
+            print(f"Failed to parse tag list JSON: {e}")
+            return None
+
+    # Build the name-to-ID mapping directly, saving a second pass over the list
+    return {tag['name']: tag['_id'] for tag in tag_list}
     
 def create_new_tag_id(session, access_token, tag):
     """
@@ -330,14 +540,14 @@ def create_new_tag_id(session, access_token, tag):
 
     # Send a POST request to the url to make a new tag
     try:
-        response = session.post(url, json=payload, headers=headers, timeout=30)
+        response = session.post(url, data=dump_request_json(payload), headers=headers, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Failed to create new tag '{tag}': {e}")
         return None
 
     try:
-        data = response.json()
+        data = parse_response_json(response)
         tag_data = data.get('data', {})
         tag_id = tag_data.get('_id')
         if not tag_id:
@@ -349,20 +559,91 @@ def create_new_tag_id(session, access_token, tag):
 
     return tag_id
 
+def prefetch_missing_tags(session, access_token, exercises_list, tag_mappings, workers=8):
+    """
+    Creates every tag requested by a batch of exercises that does not exist yet.
+
+    Collects the unique missing tag names across all exercises and creates
+    them concurrently, updating tag_mappings in place. Once this has run,
+    get_payload resolves every tag with a plain dict lookup instead of a
+    blocking create request per missing tag.
+
+    Args:
+        session (requests.Session): The active session used to make the requests.
+        access_token (str): The access token for authenticating the requests.
+        exercises_list (list): Exercise info dictionaries whose "tags" entry is a list of tag names.
+        tag_mappings (dict): The existing mapping of tag names to tag IDs, updated in place.
+        workers (int): The maximum number of concurrent tag-creation requests.
+
+    Returns:
+        dict: The updated tag_mappings.
+    """
+
+    # Validate access_token
+    if not isinstance(access_token, str) or not access_token.strip():
+        raise ValueError("Access token must be a non-empty string.")
+
+    # Collect the unique tag names that don't exist yet
+    missing = {str(tag) for exercise_info in exercises_list
+               for tag in exercise_info.get("tags", [])
+               if str(tag) and str(tag) not in tag_mappings}
+    if not missing:
+        return tag_mappings
+
+    # Create the missing tags concurrently
+    missing = sorted(missing)
+    with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+        tag_ids = executor.map(lambda tag: create_new_tag_id(session, access_token, tag), missing)
+
+    for tag, tag_id in zip(missing, tag_ids):
+        if tag_id:
+            tag_mappings[tag] = tag_id
+
+    return tag_mappings
+
+def build_payload_context(session, access_token, exercises_list):
+    """
+    Fetches the shared state get_payload needs, once per run.
+
+    Retrieves the tag mapping and pre-creates any tags the batch is missing,
+    so per-exercise payload building does no network work of its own.
+
+    Args:
+        session (requests.Session): The active session used to make the requests.
+        access_token (str): The access token for authenticating the requests.
+        exercises_list (list): Exercise info dictionaries whose "tags" entry is a list of tag names.
+
+    Returns:
+        dict: The tag name-to-ID mapping to pass to get_payload.
+    """
+    tag_mappings = get_tag_list(session, access_token) or {}
+    prefetch_missing_tags(session, access_token, exercises_list, tag_mappings)
+    return tag_mappings
+
+# Helper function to check for a missing scalar value
+# exercise_info holds plain Python values, so NaN can only appear as a float;
+# a None/float check avoids the pandas dispatch pd.isna pays per call
+def is_nan(value):
+    return value is None or (isinstance(value, float) and value != value)
+
 # Helper function to safely get string values
-def safe_str(value, default=""):
-    if pd.isna(value) or value is None:
+# NaN is caught with the float self-inequality trick (NaN != NaN), which is a
+# single C compare instead of a pandas dispatch per scalar
+def safe_str(value: object, default: str = "") -> str:
+    if value is None or (isinstance(value, float) and value != value):
         return default
     return str(value)
 
 # Helper function to safely get DataFrame values
-def safe_get(df, index, column, default=None):
+def safe_get(df, index: int, column: str, default: object = None) -> object:
     if column in df.columns:
         value = df.at[index, column]
-        return value if not pd.isna(value) else default
+        if value is None or (isinstance(value, float) and value != value):
+            return default
+        return value
     return default
 
-def get_payload(session, access_token, exercise_info, exercise_df):
+def get_payload(session, access_token, exercise_info, exercise_df, tag_mappings=None):
     """
 
     Constructs the payload for uploading an exercise to the Everfit API.
@@ -371,6 +652,9 @@ def get_payload(session, access_token, exercise_info, exercise_df):
         session (requests.Session): The active session used for making requests.
         access_token (str): The access token for authenticating API requests.
         exercise_info (dict): A dictionary containing detailed information about the exercise.
+        tag_mappings (dict, optional): A pre-built mapping of tag names to tag IDs.
+            Pass this in when building payloads for many exercises so the tag list
+            is only fetched from the API once per run.
 
     Returns:
         dict: A dictionary representing the payload with exercise details, ready to be sent to the API.
@@ -381,7 +665,7 @@ def get_payload(session, access_token, exercise_info, exercise_df):
         "author": "666c67f6c98eb80026f047c9",
         "author_name": "Ruben Lopez Martinez", 
         "title": safe_str(exercise_info.get("exercise_name")),
-        "instructions": [] if pd.isna(exercise_info["instructions"]) else safe_str(exercise_info["instructions"]).split('\n'),
+        "instructions": [] if is_nan(exercise_info["instructions"]) else safe_str(exercise_info["instructions"]).split('\n'),
         "fields": [],
         "link": "",
         "modality": "66013e83b117d35345209b07",
@@ -390,23 +674,22 @@ def get_payload(session, access_token, exercise_info, exercise_df):
         "picture": [],
         "thumbnail_url": "",
         "video": "",
-        "videoLink": "" if pd.isna(exercise_info.get("video_link", "")) else safe_str(exercise_info.get("video_link", "")),
+        "videoLink": "" if is_nan(exercise_info.get("video_link", "")) else safe_str(exercise_info.get("video_link", "")),
     }
     
     # Category Type (required)
     category = exercise_info.get("category", "strength")
-    if pd.isna(category) or category is None:
+    if is_nan(category):
         category = "strength"
+    # Normalize only the lookup key; category_type_name keeps the original text
     category_key = safe_str(category).lower().replace(" ", "")
     payload["category_type"] = CATEGORY_TYPE_MAP.get(category_key, "5cd912c319ae01d22ea76012") # else its the strength category id
     payload["category_type_name"] = category
 
     # Modality (optional, but has default)
     modality = exercise_info.get("modality", "")
-    if not pd.isna(modality) and modality is not None:
-        if modality.strip() == "":
-            modality = "empty"
-        modality_key = safe_str(modality).lower().replace(" ", "")
+    if not is_nan(modality):
+        modality_key = modality if modality.strip() else "empty"
         payload["modality"] = MODALITY_MAP.get(modality_key, "")
         # error
         if payload["modality"] == "":
@@ -414,17 +697,18 @@ def get_payload(session, access_token, exercise_info, exercise_df):
 
     # Movement Patterns (optional)
     movement_patterns = []
+    seen_pattern_ids = set()
     for idx, pattern in enumerate(exercise_info.get("movement_patterns", [])):
 
-        if pd.isna(pattern) or pattern is None or pattern == "":
+        if is_nan(pattern) or pattern == "":
             continue
 
-        pattern_key = safe_str(pattern).lower().replace(" ", "")
-        movement_pattern_id = MOVEMENT_PATTERN_MAP.get(pattern_key, "")
+        movement_pattern_id = MOVEMENT_PATTERN_MAP.get(pattern, "")
         if movement_pattern_id == "":
             raise Exception(f"Movement pattern '{pattern}' not recognized.")
-        elif any(d['movement_pattern'] == movement_pattern_id for d in movement_patterns):
+        elif movement_pattern_id in seen_pattern_ids:
             continue
+        seen_pattern_ids.add(movement_pattern_id)
         movement_patterns.append({
             "is_primary": idx == 0,
             "movement_pattern": movement_pattern_id
@@ -433,15 +717,16 @@ def get_payload(session, access_token, exercise_info, exercise_df):
 
     # Muscle Groups (optional)
     muscle_groups = []
+    seen_muscle_ids = set()
     for idx, muscle in enumerate(exercise_info.get("muscle_groups", [])):
-        if pd.isna(muscle) or muscle is None or muscle == "":
+        if is_nan(muscle) or muscle == "":
             continue
-        muscle_key = safe_str(muscle).lower().replace(" ", "")
-        muscle_group_id = MUSCLE_GROUP_MAP.get(muscle_key, "")
+        muscle_group_id = MUSCLE_GROUP_MAP.get(muscle, "")
         if muscle_group_id == "":
             raise Exception(f"Muscle group '{muscle}' not recognized.")
-        elif any(d['muscle_group'] == muscle_group_id for d in muscle_groups):
+        elif muscle_group_id in seen_muscle_ids:
             continue
+        seen_muscle_ids.add(muscle_group_id)
         muscle_groups.append({
             "is_primary": idx == 0,
             "muscle_group": muscle_group_id
@@ -451,8 +736,7 @@ def get_payload(session, access_token, exercise_info, exercise_df):
     # Tracking Fields (optional)
     tracking_fields = exercise_info.get("tracking_fields", [])
     for field in tracking_fields:
-        field_key = field.lower().replace(" ", "")
-        field_id = TRACKING_FIELDS_MAP.get(field_key, "")
+        field_id = TRACKING_FIELDS_MAP.get(field, "")
         if field_id:
             payload["fields"].append(field_id)
     # Always add the "Rest" field
@@ -461,11 +745,11 @@ def get_payload(session, access_token, exercise_info, exercise_df):
     # Tags
     tags = []
     requested_tags = exercise_info.get("tags", []) #get_requested_tags(exercise_df, exercise_info)  # For old spreadsheet
-    tag_list = get_tag_list(session, access_token) or []
-    tag_mappings = create_tag_mappings(tag_list)
+    if tag_mappings is None:
+        tag_mappings = get_tag_list(session, access_token) or {}
 
     # Add or create tag id
-    seen_tags = []
+    seen_tags = set()
     for requested_tag in requested_tags:
         requested_tag = str(requested_tag)
         if requested_tag == "" or requested_tag is None or requested_tag in seen_tags:
@@ -474,16 +758,171 @@ def get_payload(session, access_token, exercise_info, exercise_df):
             tag_id = tag_mappings[requested_tag]
         else:
             tag_id = create_new_tag_id(session, access_token, requested_tag)
+            if tag_id:
+                tag_mappings[requested_tag] = tag_id
         tags.append(tag_id)
-        seen_tags.append(requested_tag)
+        seen_tags.add(requested_tag)
     payload["tags"] = tags
 
     return payload
 
+# Spreadsheet tag columns in sheet order, keyed by their exercise_info tag name
+TAG_COLUMN_MAP = {
+    "exercise_level_1": "Basic",
+    "exercise_level_2": "Intermediate",
+    "exercise_level_3": "Advanced",
+    "skill_name_1": "SKILL NAME 1",
+    "skill_name_2": "SKILL NAME 2",
+    "skill_name_3": "SKILL NAME 3",
+    "calisthenics": "Calisthenics",
+    "wx_athlete": "WX Athlete",
+    "hp_gymnast": "HP gymnast",
+    "equipment_1": "EQUIPMENT 1",
+    "equipment_2": "EQUIPMENT 2",
+    "equipment_3": "EQUIPMENT 3",
+    "equipment_4": "EQUIPMENT 4",
+    "warm_up": "Warm up",
+    "cardio": "Cardio",
+    "crossfit_lift": "Crossfit lift",
+    "bodyweight": "Bodyweight",
+    "weight": "Weight",
+    "band_resistance": "Band resistance",
+    "weightlifting": "Weightlifting",
+    "mobility": "mobility",
+    "active": "active",
+    "passive": "passive",
+    "stretching": "stretching",
+    "upperbody": "Upperbody",
+    "lowerbody": "Lowerbody",
+    "core": "Core",
+    "push": "Push",
+    "pull": "Pull",
+    "arms_straight": "Arms straight",
+    "arms_bend": "Arms bend",
+    "iso": "Iso",
+    "plyo": "Plyo",
+    "set": "Set",
+    "shoulders": "Shoulders",
+    "pecs": "Pecs",
+    "triceps": "Triceps",
+    "biceps": "Biceps",
+    "back": "Back",
+    "abs": "Abs",
+    "lower_back": "Lower back",
+    "obliques": "Obliques",
+    "glute": "Glute",
+    "quads": "Quads",
+    "hamstrings": "Hamstrings",
+    "calves": "Calves",
+    "wrist": "Wrist",
+    "hips": "Hips",
+    "elbows": "Elbows",
+    "ankle": "Ankle",
+    "thoracic": "Thoracic",
+    "forearms": "Forearms",
+    "neck": "Neck",
+    "pull_up": "Pull up",
+    "push_up": "Push up",
+    "dip": "Dip",
+    "row": "Row",
+    "press": "Press",
+    "curl": "Curl",
+    "squat": "Squat",
+    "bridge": "Bridge",
+    "throws": "Throws",
+    "slams": "Slams",
+    "sit_up": "Sit up",
+    "leg_lift": "Leg lift",
+    "balance": "Balance",
+    "raise": "Raise",
+    "rocks": "Rocks",
+    "arch-hollow_shape": "Arch-hollow shape",
+    "rotation": "Rotation",
+    "gymnastics_skill": "Gymnastics skill",
+    "plank": "Plank",
+    "preS_explosive": "PreS explosive",
+    "preS_legs": "PreS legs",
+    "postS_legs": "PostS legs",
+    "postS_rings": "PostS rings",
+    "postS_altern_rings": "PostS altern rings",
+    "postS_weights": "PostS weights",
+}
+
+# Tag columns that hold free-text values rather than 0/1 flags
+TAG_STRING_COLUMNS = ("SKILL NAME 1", "SKILL NAME 2", "SKILL NAME 3",
+                      "EQUIPMENT 1", "EQUIPMENT 2", "EQUIPMENT 3", "EQUIPMENT 4")
+TAG_STRING_COLUMN_SET = frozenset(TAG_STRING_COLUMNS)
+
+# Default value for every spreadsheet column read by get_exercises_list
+EXERCISE_COLUMN_DEFAULTS = {
+    "EXERCISE NAME": "",
+    "VIDEO STATUS": 0,
+    "Modality": "",
+    "Muscle group": "",
+    "Muscle group 2": "",
+    "Muscle group 3": "",
+    "Movement pattern 1": "",
+    "Movement pattern 2": "",
+    "Movement pattern 3": "",
+    "Category": "strength",
+    "Tracking fields": "",
+    "Instructions": "",
+    "Video link": "",
+}
+EXERCISE_COLUMN_DEFAULTS.update(
+    {col: ("" if col in TAG_STRING_COLUMNS else 0) for col in TAG_COLUMN_MAP.values()}
+)
+
+# Cache of generated row builders, keyed by the DataFrame's column layout
+ROW_BUILDER_CACHE = {}
+
+def compile_row_builder(columns):
+    """
+    Generates a builder that turns one row tuple into an exercise_info dict.
+
+    The column positions are resolved once here for the given column layout,
+    so the generated per-row body is nothing but local tuple indexing — no
+    dict lookups, no safe_get calls, and no pd.isna dispatch. Defaults are
+    assumed to have been filled column-wise beforehand.
+
+    Args:
+        columns (tuple): The DataFrame's column names, in order.
+
+    Returns:
+        function: A builder taking one itertuples row tuple and returning the exercise_info dict.
+    """
+    position = {col: pos for pos, col in enumerate(columns)}
+    ref = lambda col: f"r[{position[col]}]"
+
+    tag_items = ", ".join(f'"{key}": {ref(col)}' for key, col in TAG_COLUMN_MAP.items())
+    source = f'''
+def build_exercise_info(r):
+    return {{
+        "exercise_name": {ref("EXERCISE NAME")},
+        "video_status": {ref("VIDEO STATUS")},
+        "description": {ref("EXERCISE NAME")},
+        "modality": {ref("Modality")},
+        "muscle_groups": [{ref("Muscle group")}, {ref("Muscle group 2")}, {ref("Muscle group 3")}],
+        "movement_patterns": [{ref("Movement pattern 1")}, {ref("Movement pattern 2")}, {ref("Movement pattern 3")}],
+        "category": {ref("Category")},
+        "tracking_fields": {ref("Tracking fields")},
+        "instructions": {ref("Instructions")},
+        "video_link": {ref("Video link")},
+        "tags": {{{tag_items}}},
+    }}
+'''
+    namespace = {}
+    exec(source, namespace)
+    return namespace["build_exercise_info"]
+
 def get_exercises_list(start_index, exercise_df, post_exercises_flag=True, put_exercises_flag=False, end_index=-1):
     """
     Extracts a list of exercises and their associated information from a DataFrame.
 
+    The relevant rows are sliced and default-filled with vectorized pandas
+    operations instead of per-cell lookups, so the per-row work is just
+    building plain dicts.
+
     Args:
         start_index (int): The row index from which to start reading exercise data.
         exercise_df (DataFrame): The DataFrame containing exercise information.
@@ -492,148 +931,48 @@ def get_exercises_list(start_index, exercise_df, post_exercises_flag=True, put_e
         list: A list of dictionaries, each containing detailed information about an exercise.
     """
 
-    # Creates a list of exercises with information
-    exercises_list = []
-
     if end_index == -1:
         end_index = len(exercise_df)
 
-    # Goes through each cell with an exercise, adding info to list of exercises
-    for i in range(start_index, min(len(exercise_df), end_index+1)):
-        # Breaks if at end
-        if pd.isna(exercise_df.iloc[i, 0]):
-            break
-        
-        # Continue if video status is not 1
-        video_status = safe_get(exercise_df, i, "VIDEO STATUS", 0)
-        if post_exercises_flag and video_status != 1:
-            continue
-        # To update exercises
-        elif put_exercises_flag and video_status != 3:
-            continue
-        
-        # Creates a dictionary of exercise info
-        exercise_info = {
-            "exercise_name": safe_get(exercise_df, i, "EXERCISE NAME", ""),
-            "video_status": video_status,
-            "description": safe_get(exercise_df, i, "EXERCISE NAME", ""),
-            "modality": safe_get(exercise_df, i, "Modality", ""),
-            "muscle_groups": [
-                safe_get(exercise_df, i, "Muscle group", ""),
-                safe_get(exercise_df, i, "Muscle group 2", ""),
-                safe_get(exercise_df, i, "Muscle group 3", "")
-            ],
-            "movement_patterns":  [
-                safe_get(exercise_df, i, "Movement pattern 1", ""),
-                safe_get(exercise_df, i, "Movement pattern 2", ""),
-                safe_get(exercise_df, i, "Movement pattern 3", "")
-            ],
-            "category": safe_get(exercise_df, i, "Category", "strength"),
-            "tracking_fields": safe_get(exercise_df, i, "Tracking fields", ""),
-            "instructions": safe_get(exercise_df, i, "Instructions", ""),
-            "video_link": safe_get(exercise_df, i, "Video link", ""),
-            "tags": {
-                "exercise_level_1": safe_get(exercise_df, i, "Basic", 0),
-                "exercise_level_2": safe_get(exercise_df, i, "Intermediate", 0),
-                "exercise_level_3": safe_get(exercise_df, i, "Advanced", 0),
-                "skill_name_1": safe_get(exercise_df, i, "SKILL NAME 1", ""), 
-                "skill_name_2": safe_get(exercise_df, i, "SKILL NAME 2", ""), 
-                "skill_name_3": safe_get(exercise_df, i, "SKILL NAME 3", ""), 
-                "calisthenics": safe_get(exercise_df, i, "Calisthenics", 0),
-                "wx_athlete": safe_get(exercise_df, i, "WX Athlete", 0),
-                "hp_gymnast": safe_get(exercise_df, i, "HP gymnast", 0),
-                "equipment_1": safe_get(exercise_df, i, "EQUIPMENT 1", ""), 
-                "equipment_2": safe_get(exercise_df, i, "EQUIPMENT 2", ""), 
-                "equipment_3": safe_get(exercise_df, i, "EQUIPMENT 3", ""), 
-                "equipment_4": safe_get(exercise_df, i, "EQUIPMENT 4", ""), 
-                "warm_up": safe_get(exercise_df, i, "Warm up", 0),
-                "cardio": safe_get(exercise_df, i, "Cardio", 0),
-                "crossfit_lift": safe_get(exercise_df, i, "Crossfit lift", 0),
-                "bodyweight": safe_get(exercise_df, i, "Bodyweight", 0),
-                "weight": safe_get(exercise_df, i, "Weight", 0),
-                "band_resistance": safe_get(exercise_df, i, "Band resistance", 0),
-                "weightlifting": safe_get(exercise_df, i, "Weightlifting", 0),
-                "mobility": safe_get(exercise_df, i, "mobility", 0),
-                "active": safe_get(exercise_df, i, "active", 0),
-                "passive": safe_get(exercise_df, i, "passive", 0),
-                "stretching": safe_get(exercise_df, i, "stretching", 0),
-                "upperbody": safe_get(exercise_df, i, "Upperbody", 0),
-                "lowerbody": safe_get(exercise_df, i, "Lowerbody", 0),
-                "core": safe_get(exercise_df, i, "Core", 0),
-                "push": safe_get(exercise_df, i, "Push", 0),
-                "pull": safe_get(exercise_df, i, "Pull", 0),
-                "arms_straight": safe_get(exercise_df, i, "Arms straight", 0),
-                "arms_bend": safe_get(exercise_df, i, "Arms bend", 0),
-                "iso": safe_get(exercise_df, i, "Iso", 0),
-                "plyo": safe_get(exercise_df, i, "Plyo", 0),
-                "set": safe_get(exercise_df, i, "Set", 0),
-                "shoulders": safe_get(exercise_df, i, "Shoulders", 0),
-                "pecs": safe_get(exercise_df, i, "Pecs", 0),
-                "triceps": safe_get(exercise_df, i, "Triceps", 0),
-                "biceps": safe_get(exercise_df, i, "Biceps", 0),
-                "back": safe_get(exercise_df, i, "Back", 0),
-                "abs": safe_get(exercise_df, i, "Abs", 0),
-                "lower_back": safe_get(exercise_df, i, "Lower back", 0),
-                "obliques": safe_get(exercise_df, i, "Obliques", 0),
-                "glute": safe_get(exercise_df, i, "Glute", 0),
-                "quads": safe_get(exercise_df, i, "Quads", 0),
-                "hamstrings": safe_get(exercise_df, i, "Hamstrings", 0),
-                "calves": safe_get(exercise_df, i, "Calves", 0),
-                "wrist": safe_get(exercise_df, i, "Wrist", 0),
-                "hips": safe_get(exercise_df, i, "Hips", 0),
-                "elbows": safe_get(exercise_df, i, "Elbows", 0),
-                "ankle": safe_get(exercise_df, i, "Ankle", 0),
-                "thoracic": safe_get(exercise_df, i, "Thoracic", 0),
-                "forearms": safe_get(exercise_df, i, "Forearms", 0),
-                "neck": safe_get(exercise_df, i, "Neck", 0),
-                "pull_up": safe_get(exercise_df, i, "Pull up", 0),
-                "push_up": safe_get(exercise_df, i, "Push up", 0),
-                "dip": safe_get(exercise_df, i, "Dip", 0),
-                "row": safe_get(exercise_df, i, "Row", 0),
-                "press": safe_get(exercise_df, i, "Press", 0),
-                "curl": safe_get(exercise_df, i, "Curl", 0),
-                "squat": safe_get(exercise_df, i, "Squat", 0),
-                "bridge": safe_get(exercise_df, i, "Bridge", 0),
-                "throws": safe_get(exercise_df, i, "Throws", 0),
-                "slams": safe_get(exercise_df, i, "Slams", 0),
-                "sit_up": safe_get(exercise_df, i, "Sit up", 0),
-                "leg_lift": safe_get(exercise_df, i, "Leg lift", 0),
-                "balance": safe_get(exercise_df, i, "Balance", 0),
-                "raise": safe_get(exercise_df, i, "Raise", 0),
-                "rocks": safe_get(exercise_df, i, "Rocks", 0),
-                "arch-hollow_shape": safe_get(exercise_df, i, "Arch-hollow shape", 0),
-                "rotation": safe_get(exercise_df, i, "Rotation", 0),
-                "gymnastics_skill": safe_get(exercise_df, i, "Gymnastics skill", 0),
-                "plank": safe_get(exercise_df, i, "Plank", 0),
-                "preS_explosive": safe_get(exercise_df, i, "PreS explosive", 0),
-                "preS_legs": safe_get(exercise_df, i, "PreS legs", 0),
-                "postS_legs": safe_get(exercise_df, i, "PostS legs", 0),
-                "postS_rings": safe_get(exercise_df, i, "PostS rings", 0),
-                "postS_altern_rings": safe_get(exercise_df, i, "PostS altern rings", 0),
-                "postS_weights": safe_get(exercise_df, i, "PostS weights", 0),
-            }  
-        }
-
-        # Adds to list of exercises
-        exercises_list.append(exercise_info)
-
-    return exercises_list
-
-def create_tag_mappings(tag_list):
-    """
-    Creates a dictionary mapping tag names to their corresponding IDs.
-
-    Args:
-        tag_list (list): A list of dictionaries where each dictionary contains
-                         'name' and '_id' fields representing a tag.
-
-    Returns:
-        dict: A dictionary where keys are tag names and values are tag IDs.
-    """
-    tag_mappings = {}
-    for tag in tag_list:
-        tag_mappings[tag['name']] = tag['_id']
-    return tag_mappings
+    # Slices the requested rows once
+    sub = exercise_df.iloc[start_index:min(len(exercise_df), end_index + 1)]
+
+    # Stops at the first empty exercise cell, like the old per-row break
+    first_col_na = sub.iloc[:, 0].isna().to_numpy()
+    if first_col_na.any():
+        sub = sub.iloc[:first_col_na.argmax()]
+    if len(sub) == 0:
+        return []
+
+    # Makes sure every expected column exists, then fills defaults column-wise
+    missing = [col for col in EXERCISE_COLUMN_DEFAULTS if col not in sub.columns]
+    if missing:
+        sub = sub.reindex(columns=[*sub.columns, *missing])
+    sub = sub.fillna(EXERCISE_COLUMN_DEFAULTS)
+
+    # Keeps only the rows whose video status matches the requested operation
+    if post_exercises_flag:
+        sub = sub[sub["VIDEO STATUS"] == 1]
+    elif put_exercises_flag:
+        sub = sub[sub["VIDEO STATUS"] == 3]
+
+    # Normalizes the lookup-key columns once (lowercase, no spaces) so
+    # get_payload can index the config maps directly. Category is left as-is:
+    # its original text is sent to the API as category_type_name
+    for col in ("Modality",
+                "Muscle group", "Muscle group 2", "Muscle group 3",
+                "Movement pattern 1", "Movement pattern 2", "Movement pattern 3"):
+        sub[col] = sub[col].astype(str).str.lower().str.replace(" ", "", regex=False)
+
+    # Builds each exercise info dict with a builder generated once for this
+    # column layout, so the per-row work is plain tuple indexing
+    columns = tuple(sub.columns)
+    builder = ROW_BUILDER_CACHE.get(columns)
+    if builder is None:
+        builder = compile_row_builder(columns)
+        ROW_BUILDER_CACHE[columns] = builder
+
+    return [builder(row) for row in sub.itertuples(index=False, name=None)]
 
 def get_requested_tags(exercise_df, exercise_info):
     """
@@ -648,22 +987,18 @@ def get_requested_tags(exercise_df, exercise_info):
         list: A list of tag names associated with the exercise.
     """
     requested_tags = []
-    string_cols = ["SKILL NAME 1", "SKILL NAME 2", "SKILL NAME 3", "EQUIPMENT 1", "EQUIPMENT 2", "EQUIPMENT 3", "EQUIPMENT 4"]
-    col_names = exercise_df.columns.tolist()
-    cur_tag_col = col_names.index("Basic")
 
-    # Goes through each tag, adding the proper tag name to the list
+    # Goes through each tag, resolving its column through the precomputed map
+    # instead of rescanning the DataFrame's column list per call
     for key, val in exercise_info.get('tags', {}).items():
-        col_name = col_names[cur_tag_col]
+        col_name = TAG_COLUMN_MAP.get(key, key)
         # Skip if na or 0
         if pd.isna(val) or val == 0 or val is None or val == "":
-            cur_tag_col += 1
             continue
-        # Add value if in string_cols, else add col name
-        if col_name in string_cols:
+        # Add value if a free-text column, else add col name
+        if col_name in TAG_STRING_COLUMN_SET:
             requested_tags.append(val)
         else:
             requested_tags.append(col_name)
-        cur_tag_col += 1
-            
+
     return requested_tags
\ No newline at end of file
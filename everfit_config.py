@@ -77,5 +77,13 @@ TRACKING_FIELDS_MAP = {
     "round": "60decc9a46b851e3698d840f"
 }
 
+# Normalize all lookup keys once at import time (lowercase, no spaces) so
+# callers can index the maps directly with pre-normalized values
+CATEGORY_TYPE_MAP = {k.lower().replace(" ", ""): v for k, v in CATEGORY_TYPE_MAP.items()}
+MODALITY_MAP = {k.lower().replace(" ", ""): v for k, v in MODALITY_MAP.items()}
+MOVEMENT_PATTERN_MAP = {k.lower().replace(" ", ""): v for k, v in MOVEMENT_PATTERN_MAP.items()}
+MUSCLE_GROUP_MAP = {k.lower().replace(" ", ""): v for k, v in MUSCLE_GROUP_MAP.items()}
+TRACKING_FIELDS_MAP = {k.lower().replace(" ", ""): v for k, v in TRACKING_FIELDS_MAP.items()}
+
 REVERSE_TRACKING_FIELDS_MAP = {v: k for k, v in TRACKING_FIELDS_MAP.items()}
 
@@ -1,14 +1,87 @@
+import json
+import numpy as np
 import pandas as pd
-import requests
 import getpass
+import os
 import re
 from itertools import zip_longest
+from pathlib import Path
 
-from everfit_api import login, post_exercise, get_exercises, put_exercise, get_payload, get_exercises_list
+from everfit_api import login, make_session, batch_post_exercises, get_exercises, put_exercise, get_payload, get_exercises_list, build_payload_context, prefetch_missing_tags
+
+# How many sheet rows to parse and upload per batch
+CHUNK_SIZE = 256
+
+# Columns the uploader reads from the sheet; any that are missing are added
+# as empty columns at load time
+REQUIRED_COLS = ["Name", "Instructions", "Spanish Instructions", "Movement Patterns",
+                 "Muscle Group", "Tracking Fields", "Exercise Tags", "Video Link",
+                 "Everfit Uploaded"]
+
+# Matches one ";"-separated instruction step, skipping surrounding whitespace
+# and any leading "1. " style numbering; compiled once at module scope
+_INSTRUCTION_STEP = re.compile(r'\s*(?:\d+\.\s*)?([^;]*?)\s*(?:;|$)')
+
+# Helper function to yield an instruction cell's cleaned steps lazily from a
+# single linear scan, so consumers never materialize intermediate lists
+def iter_instruction_steps(value):
+    if pd.isna(value) or value == "":
+        return
+    for m in _INSTRUCTION_STEP.finditer(str(value)):
+        if m.group(1):
+            yield m.group(1)
+
+def load_exercise_df(file_path):
+    """
+    Loads the exercise workbook, using a Parquet sidecar cache when it is fresh.
+
+    Parsing the Excel file is the slowest ingestion step, so after a
+    successful read the DataFrame is persisted next to the workbook along
+    with the workbook's mtime and size. As long as the workbook has not
+    changed, reruns load the Parquet copy instead of re-parsing the xlsx.
+
+    Args:
+        file_path (str): The path to the Excel file.
+
+    Returns:
+        DataFrame: The loaded exercise data.
+    """
+    cache_path = Path(file_path + ".cache.parquet")
+    meta_path = Path(file_path + ".cache.json")
+
+    stat = os.stat(file_path)
+    meta = {"mtime": stat.st_mtime, "size": stat.st_size}
+
+    # Use the cache if it matches the workbook's current stat
+    if cache_path.exists() and meta_path.exists():
+        try:
+            if json.loads(meta_path.read_text()) == meta:
+                return pd.read_parquet(cache_path)
+        except (ValueError, OSError):
+            pass
+
+    # The Rust-backed calamine engine parses xlsx files several times
+    # faster than the default openpyxl; fall back if it is not installed
+    # (ImportError) or pandas is too old to know the engine (ValueError)
+    try:
+        df = pd.read_excel(file_path, engine="calamine")
+    except (ImportError, ValueError):
+        df = pd.read_excel(file_path)
+
+    # Refresh the cache best-effort: skip silently when no parquet engine is
+    # installed or the frame has columns Parquet cannot store (e.g. mixed-type
+    # object columns); the freshly parsed DataFrame is still returned
+    try:
+        df.to_parquet(cache_path)
+        meta_path.write_text(json.dumps(meta))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    return df
 
 def upload_exercises_to_everfit():
-    # Start a session
-    session = requests.Session()
+    # Start a session with connection pooling, retries, and gzip configured
+    session = make_session()
 
     # Get user credentials from user input
     email = input("Enter your Everfit email: ").strip()
@@ -23,7 +96,7 @@ def upload_exercises_to_everfit():
     # Load exercise data from Excel
     file_path = input("Enter the path to the Excel file: ").strip()
     try:
-        df = pd.read_excel(file_path)
+        df = load_exercise_df(file_path)
     except FileNotFoundError:
         print("Excel file not found. Please check the path and try again.")
         return
@@ -31,114 +104,173 @@ def upload_exercises_to_everfit():
         print(f"Error reading Excel file: {e}")
         return
     
-    exercises_info = []
-    
-    # Get exercise information from Excel
-    for idx, row in df.iterrows():
-        # Handle NaN values in "Everfit Uploaded" column
-        everfit_uploaded = row.get("Everfit Uploaded", 0)
-        if pd.isna(everfit_uploaded):
-            everfit_uploaded = 0
-        elif everfit_uploaded == 1:
-            continue
-        
-        # Skip rows with NaN exercise names
-        exercise_name = row.get("Name", "")
-        if pd.isna(exercise_name) or exercise_name == "":
-            continue
-            
-        print(f"Processing exercise: {exercise_name}")
-
-        # Helper function to safely handle string operations on potentially NaN values
-        def safe_string_split(value, delimiter=";"):
-            if pd.isna(value) or value == "":
-                return []
-            return [part.strip() for part in str(value).split(delimiter) if part.strip()]
-
-        raw_instructions = row.get("Instructions", "")
-        instruction_parts = safe_string_split(raw_instructions)
-        raw_spanish_instructions = row.get("Spanish Instructions", "")
-        spanish_instruction_parts = safe_string_split(raw_spanish_instructions)
-        # Strip numbering
-        instruction_parts = [re.sub(r'^\d+\.\s*', '', s) for s in instruction_parts]
-        spanish_instruction_parts = [re.sub(r'^\d+\.\s*', '', s) for s in spanish_instruction_parts]
-        # Pair each English with Spanish counterpart
-        instructions = []
-        for eng, spa in zip_longest(instruction_parts, spanish_instruction_parts, fillvalue=""):
-            pair = " | ".join(p for p in (eng, spa) if p)
-            instructions.append(pair)
-        # Separate by newline
-        instructions_mixed = "\n".join(instructions)
-
-        movement_patterns = safe_string_split(row.get("Movement Patterns", ""))
-        muscle_groups = safe_string_split(row.get("Muscle Group", ""))
-        tracking_fields = safe_string_split(row.get("Tracking Fields", ""))
-        tags = safe_string_split(row.get("Exercise Tags", ""))
-
-        exercise_info_dict = {
-            # (required) Title of the exercise
-            "exercise_name": exercise_name,  # str
-
-            # (optional) Multi‐line instructions (each "n" becomes a separate list element)
-            # Either:
-            #   • a single string with newline separators, e.g. "Line 1nLine 2", or
-            #   • None/NaN if you want payload["instructions"] == []
-            "instructions": instructions_mixed,  # str (possibly containing "n") or pandas.NaN
-
-            # (optional) Which modality this exercise falls under.
-            # Must match one of the keys in MODALITY_MAP (e.g. "bodyweight", "dumbbell", etc.), or ""/NaN to leave default.
-            "modality": "",  # str
-
-            # (required) Primary category, e.g. "strength", "flexibility", etc.
-            # Must match a key in CATEGORY_TYPE_MAP (lowercased, no spaces). If blank/NaN, defaults to "strength".
-            "category": "",  # str
-
-            # (optional) A list of movement‐pattern names (each must match a key in MOVEMENT_PATTERN_MAP).
-            # The first element is treated as primary (is_primary=True), any duplicates are ignored.
-            "movement_patterns": movement_patterns,  # list[str]
-
-            # (optional) A list of muscle‐group names (each must match a key in MUSCLE_GROUP_MAP).
-            # The first element is treated as primary (is_primary=True), duplicates are ignored.
-            "muscle_groups": muscle_groups,  # list[str]
-
-            # (optional) Any tracking fields you want (comma‐separated string).
-            # Example: "Reps,Weight,Duration". Each token is looked up in TRACKING_FIELDS_MAP.
-            # If blank/NaN, it will simply add the default "Rest" field.
-            "tracking_fields": tracking_fields,  # str or pandas.NaN
-
-            # (optional) A URL for a demo video. If blank/NaN, payload["videoLink"] becomes "".
-            "video_link": str(row.get("Video Link", "")),  # str or pandas.NaN
-
-            # (optional) A dictionary of tag‐columns from your Excel sheet. get_requested_tags(...) will scan through this dict 
-            # and pick any column whose value is nonzero/nonnull. Keys should match the column names in your sheet, e.g.:
-            #    "exercise_level_1", "exercise_level_2", "exercise_level_3",
-            #    "SKILL NAME 1", "SKILL NAME 2", "SKILL NAME 3",
-            #    "EQUIPMENT 1", "EQUIPMENT 2", … etc.
-            # Values are typically 0/1 or blank. get_requested_tags(...) only cares if value != 0/NaN.
-            "tags": tags,
-        }
-        exercises_info.append(exercise_info_dict)
-    
-    # Upload each exercise to Everfit
-    for exercise_info in exercises_info:
-        name = exercise_info.get("exercise_name", "Unknown")
-        try:
-            payload = get_payload(session, access_token, exercise_info, df)
-        except Exception as e:
-            print(f"Error generating payload for exercise {name}: {e}")
-            continue
-        
-        response = post_exercise(session, payload, access_token)
-        if response and response.get("exercise"):
-            print(f"Successfully added '{name}'")
-            df.loc[df["Name"] == name, "Everfit Uploaded"] = 1
+    # Guarantee every required column exists with one C-level reindex, then
+    # pull them into NumPy arrays once; iterrows would rebuild a Series
+    # (dtype coercion plus per-cell index lookups) for every row
+    missing_cols = [name for name in REQUIRED_COLS if name not in df.columns]
+    if missing_cols:
+        df = df.reindex(columns=[*df.columns, *missing_cols], fill_value="")
+
+    # Type the uploaded flag once at load (blank cells count as not uploaded),
+    # so the pending check is an int8 compare on a C array instead of
+    # object-dtype coercion per cell
+    df["Everfit Uploaded"] = pd.to_numeric(df["Everfit Uploaded"], errors="coerce").fillna(0).astype("int8")
+
+    cols = {name: df[name].to_numpy() for name in REQUIRED_COLS}
+
+    # Select the pending rows with one vectorized mask instead of a Python
+    # branch per row: skip rows already uploaded or without an exercise name
+    name_series = pd.Series(cols["Name"])
+    pending = (cols["Everfit Uploaded"] != 1) & name_series.notna().to_numpy() & (name_series != "").to_numpy()
+
+    # Split the list-valued columns once with vectorized .str operations; the
+    # literal ";" delimiter takes pandas' fast non-regex split path, leaving
+    # only the strip/filter step per cell. Skipped rows are blanked first so
+    # they cost nothing to split; .where keeps NaN cells as NaN (np.where
+    # would stringify them to "nan") so fillna can still blank them
+    def split_list_column(name):
+        values = pd.Series(cols[name]).where(pending, "")
+        parts = values.fillna("").astype(str).str.split(";")
+        return parts.map(lambda items: [p.strip() for p in items if p.strip()]).to_numpy()
+
+    movement_patterns_col = split_list_column("Movement Patterns")
+    muscle_groups_col = split_list_column("Muscle Group")
+    tracking_fields_col = split_list_column("Tracking Fields")
+    tags_col = split_list_column("Exercise Tags")
+
+    # Normalize Video Link with one C-level cast instead of a per-row str(),
+    # which also stops NaN cells from becoming the literal string "nan"
+    video_link_series = pd.Series(cols["Video Link"])
+    video_links = video_link_series.where(video_link_series.notna(), "").astype(str).to_numpy()
+
+    pending_idx = np.flatnonzero(pending)
+    workers = int(os.getenv("EVERFIT_UPLOAD_CONCURRENCY", "16"))
+    tag_mappings = None
+    successes = []
+
+    # Process the sheet in fixed-size chunks: parse, upload, and record each
+    # slice before moving to the next, so peak memory stays proportional to
+    # the chunk size rather than the whole workbook
+    for chunk_start in range(0, len(pending_idx), CHUNK_SIZE):
+        chunk_indices = pending_idx[chunk_start:chunk_start + CHUNK_SIZE]
+
+        # Get exercise information from Excel
+        exercises_info = []
+        for i in chunk_indices:
+            exercise_name = cols["Name"][i]
+            print(f"Processing exercise: {exercise_name}")
+
+            # Pair each English line with its Spanish counterpart, newline-
+            # separated, streaming straight from the regex scans of both cells
+            instructions_mixed = "\n".join(
+                " | ".join(p for p in pair if p)
+                for pair in zip_longest(
+                    iter_instruction_steps(cols["Instructions"][i]),
+                    iter_instruction_steps(cols["Spanish Instructions"][i]),
+                    fillvalue="",
+                )
+            )
+
+            movement_patterns = movement_patterns_col[i]
+            muscle_groups = muscle_groups_col[i]
+            tracking_fields = tracking_fields_col[i]
+            tags = tags_col[i]
+
+            # Normalize lookup values to the lowercased/spaceless map keys here,
+            # once per row, so get_payload can index the config maps directly
+            movement_patterns = [p.lower().replace(" ", "") for p in movement_patterns]
+            muscle_groups = [m.lower().replace(" ", "") for m in muscle_groups]
+            tracking_fields = [f.lower().replace(" ", "") for f in tracking_fields]
+
+            exercise_info_dict = {
+                # (required) Title of the exercise
+                "exercise_name": exercise_name,  # str
+
+                # (optional) Multi‐line instructions (each "n" becomes a separate list element)
+                # Either:
+                #   • a single string with newline separators, e.g. "Line 1nLine 2", or
+                #   • None/NaN if you want payload["instructions"] == []
+                "instructions": instructions_mixed,  # str (possibly containing "n") or pandas.NaN
+
+                # (optional) Which modality this exercise falls under.
+                # Must match one of the keys in MODALITY_MAP (e.g. "bodyweight", "dumbbell", etc.), or ""/NaN to leave default.
+                "modality": "",  # str
+
+                # (required) Primary category, e.g. "strength", "flexibility", etc.
+                # Must match a key in CATEGORY_TYPE_MAP (lowercased, no spaces). If blank/NaN, defaults to "strength".
+                "category": "",  # str
+
+                # (optional) A list of movement‐pattern names (each must match a key in MOVEMENT_PATTERN_MAP).
+                # The first element is treated as primary (is_primary=True), any duplicates are ignored.
+                "movement_patterns": movement_patterns,  # list[str]
+
+                # (optional) A list of muscle‐group names (each must match a key in MUSCLE_GROUP_MAP).
+                # The first element is treated as primary (is_primary=True), duplicates are ignored.
+                "muscle_groups": muscle_groups,  # list[str]
+
+                # (optional) Any tracking fields you want (comma‐separated string).
+                # Example: "Reps,Weight,Duration". Each token is looked up in TRACKING_FIELDS_MAP.
+                # If blank/NaN, it will simply add the default "Rest" field.
+                "tracking_fields": tracking_fields,  # str or pandas.NaN
+
+                # (optional) A URL for a demo video. If blank/NaN, payload["videoLink"] becomes "".
+                "video_link": video_links[i],  # str
+
+                # (optional) A dictionary of tag‐columns from your Excel sheet. get_requested_tags(...) will scan through this dict 
+                # and pick any column whose value is nonzero/nonnull. Keys should match the column names in your sheet, e.g.:
+                #    "exercise_level_1", "exercise_level_2", "exercise_level_3",
+                #    "SKILL NAME 1", "SKILL NAME 2", "SKILL NAME 3",
+                #    "EQUIPMENT 1", "EQUIPMENT 2", … etc.
+                # Values are typically 0/1 or blank. get_requested_tags(...) only cares if value != 0/NaN.
+                "tags": tags,
+            }
+            exercises_info.append(exercise_info_dict)
+
+        # Fetch the tag mapping on the first chunk and pre-create missing tags
+        # per chunk, so payload building does no network work of its own
+        if tag_mappings is None:
+            tag_mappings = build_payload_context(session, access_token, exercises_info)
         else:
-            print(f"Failed to add '{name}'. Response: {response}")
+            prefetch_missing_tags(session, access_token, exercises_info, tag_mappings)
+
+        # Build the payload for each exercise
+        names = []
+        payloads = []
+        for exercise_info in exercises_info:
+            name = exercise_info.get("exercise_name", "Unknown")
+            try:
+                payload = get_payload(session, access_token, exercise_info, df, tag_mappings)
+            except Exception as e:
+                print(f"Error generating payload for exercise {name}: {e}")
+                continue
+            names.append(name)
+            payloads.append(payload)
 
-    # Save the updated Excel file
-    df.to_excel(file_path, index=False)
+        # Upload the chunk to Everfit concurrently; the in-flight request
+        # count can be tuned for the link without editing the script
+        responses = batch_post_exercises(session, access_token, payloads, workers=workers)
+        for name, response in zip(names, responses):
+            if response and response.get("exercise"):
+                print(f"Successfully added '{name}'")
+                successes.append(name)
+            else:
+                print(f"Failed to add '{name}'. Response: {response}")
 
-    print(f"Updated {len(exercises_info)} exercises in {file_path}")
+    # Mark all uploaded rows with one vectorized write instead of a
+    # full-column scan per exercise
+    if successes:
+        df.loc[df["Name"].isin(successes), "Everfit Uploaded"] = 1
+
+    # Save the updated Excel file, but only if something actually changed;
+    # xlsxwriter streams rows out instead of building openpyxl's in-memory DOM
+    if successes:
+        try:
+            df.to_excel(file_path, index=False, engine="xlsxwriter")
+        except ImportError:
+            df.to_excel(file_path, index=False)
+        print(f"Updated {len(successes)} exercises in {file_path}")
+    else:
+        print("No exercises were uploaded; Excel file left unchanged.")
 
     session.close()
 